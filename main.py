@@ -13,45 +13,116 @@ Enhancements over v1.2.9:
 """
 
 
-import os, re, json, tempfile, urllib.parse, time
+import os, io, re, sys, json, tempfile, urllib.parse, time, random, threading, hashlib, itertools
+import atexit, copy, functools, logging, queue
+from logging.handlers import QueueHandler, QueueListener
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, wait, FIRST_COMPLETED
 from pathlib import Path
-from typing import Optional, List
+from typing import Optional, List, Tuple
 
-from fastapi import FastAPI, HTTPException, UploadFile, File, Form
+from fastapi import FastAPI, HTTPException, UploadFile, File, Form, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import Response, ORJSONResponse
 
+from anyio import CapacityLimiter, to_thread
+from cachetools import TTLCache
+import diskcache
 from youtube_transcript_api import YouTubeTranscriptApi
-import yt_dlp, pdfplumber, google.generativeai as genai, requests
+import yt_dlp, pdfplumber, google.generativeai as genai, httpx
 from dotenv import load_dotenv
 
 # ---------------- Global Safe-Mode Timeouts (Optimized for Render Free Tier) ----------------
 REQUEST_TIMEOUT = 20  # Reduced for free tier
 YTDLP_SOCKET_TIMEOUT = 10  # Faster timeout
 YTDLP_RETRIES = 1
+YTDLP_PROBE_WORKERS = 3  # Max strategies in flight at once
+YTDLP_HEDGE_DELAY = 4  # Seconds a probe may run before the next strategy is started alongside it
 HLS_SEGMENT_LIMIT = 30  # Reduced to save memory
-MAX_CONCURRENT_REQUESTS = 10  # Limit concurrent requests
+HLS_SEGMENT_WORKERS = 10  # Parallel segment downloads
+MAX_CONCURRENT_REQUESTS = 10  # Blocking extraction/summary calls allowed to run at once
+TRANSIENT_HTTP_STATUS = {429, 500, 502, 503, 504}  # Worth retrying with backoff
+VIDEO_INFO_CACHE_SIZE = 128
+VIDEO_INFO_CACHE_TTL = 300  # Seconds; subtitle URLs in the info expire eventually
+TRANSCRIPT_CACHE_SIZE = 256
+TRANSCRIPT_CACHE_TTL = 3600  # Seconds
+TRANSCRIPT_DISK_TTL = 86400  # Seconds; the disk tier survives --limit-max-requests worker restarts
+SUMMARY_CACHE_SIZE = 128  # Recent summaries kept in memory
+SHORT_BYPASS_CHARS = 1500  # Short summaries of inputs below this skip Gemini
+CHUNK_CHARS = 80000  # Max characters of input per Gemini chunk
+CHUNK_OVERLAP_CHARS = 400  # Context repeated at the start of the next chunk
+
+# ---------------- Precompiled Patterns ----------------
+_VID_PATS = [re.compile(r"(?:v=|\/)([0-9A-Za-z_-]{11})(?:[&\?#]|$)"), re.compile(r"youtu\.be\/([0-9A-Za-z_-]{11})")]
+_VID_FALLBACK = re.compile(r"([0-9A-Za-z_-]{11})")
+_VTT_SKIP = re.compile(r"^(?:\d+|WEBVTT|-->)")
+_EN_LANG_RE = re.compile(r"^en([\-_][a-z]+)?$")
+_BOLD_RE = re.compile(r"\*\*(.+?)\*\*")
+_BOLD_HEADER_LINE_RE = re.compile(r"^<strong>.+:</strong>$")
+_BULLET_RE = re.compile(r"^[-*•]\s+(.*)")  # Bullet marker + whitespace; group 1 is the item text
+_MD_H3_RE = re.compile(r"^###\s*(.+)$")
+_MD_H2_RE = re.compile(r"^##\s*(.+)$")
+_MD_H1_RE = re.compile(r"^#\s*(.+)$")
+_STRONG_COLON_RE = re.compile(r"<strong>([^<]+:)</strong>")
+# Applied in order to each line of detailed summaries
+_DETAILED_HEADER_SUBS = (
+    (_MD_H3_RE, r"<h4>\1</h4>"),
+    (_MD_H2_RE, r"<h3>\1</h3>"),
+    (_MD_H1_RE, r"<h3>\1</h3>"),
+    (_STRONG_COLON_RE, r"<h4>\1</h4>"),
+)
+# Metadata labels rendered as headers in short summaries (plain prefixes, no regex needed)
+_HEADER_PREFIXES = ("Video Title:", "Title:", "Uploader:", "Duration:", "Views:", "Upload Date:", "Description:", "Note:")
+# Model/metadata text is escaped before any tags are generated around it
+_ESCAPE = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;"})
+
+# ---------------- Logging ----------------
+# Records are queued by the calling thread; a background listener does the stdout I/O
+logger = logging.getLogger("SmartSummarizer")
+if not logger.handlers:
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    _log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _log_stream = logging.StreamHandler(sys.stdout)
+    _log_stream.setFormatter(logging.Formatter("[SmartSummarizer] %(message)s"))
+    _log_listener = QueueListener(_log_queue, _log_stream)
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
+    logger.addHandler(QueueHandler(_log_queue))
 
 # ---------------- Setup ----------------
 load_dotenv()
 GEMINI_KEY = os.getenv("GEMINI_API_KEY")
 YTDLP_COOKIES = os.getenv("YTDLP_COOKIES")
 if YTDLP_COOKIES and not os.path.exists(YTDLP_COOKIES):
-    print(f"[SmartSummarizer] Warning: cookie file not found at {YTDLP_COOKIES}")
+    logger.warning("Warning: cookie file not found at %s", YTDLP_COOKIES)
     YTDLP_COOKIES = None
 
 if GEMINI_KEY:
     try:
         genai.configure(api_key=GEMINI_KEY)
     except Exception as e:
-        print("Warning: genai.configure() failed:", e)
+        logger.warning("Warning: genai.configure() failed: %s", e)
+
+# Shared HTTP/2 client: subtitle/segment fetches to the same YouTube host are
+# multiplexed over one pooled TLS connection (httpx.Client is thread-safe)
+SESSION = httpx.Client(
+    http2=True,
+    follow_redirects=True,
+    limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+    headers={
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+        "Accept-Language": "en-US,en;q=0.9",
+    },
+)
 
 app = FastAPI(
     title="Smart Summarizer (Render Free Tier Optimized)", 
     version="1.3.2",
     docs_url=None,  # Disable docs in production to save memory
-    redoc_url=None
+    redoc_url=None,
+    default_response_class=ORJSONResponse,  # orjson encodes large summaries faster than stdlib json
 )
 
 app.add_middleware(
@@ -63,9 +134,6 @@ app.add_middleware(
 )
 
 # ---------------- Utilities ----------------
-def log(s: str): 
-    print("[SmartSummarizer] " + s)
-
 def _safe_gemini_text(resp) -> str:
     if not resp: return ""
     text = getattr(resp, "text", None)
@@ -80,13 +148,33 @@ def _safe_gemini_text(resp) -> str:
             except Exception: pass
     return str(resp).strip() if resp else ""
 
+def _backoff_delay(n: int, base: float = 0.25, cap: float = 4.0) -> float:
+    """Exponential backoff with jitter so retries don't hit YouTube in lockstep.
+    Also used as yt-dlp's retry_sleep_functions, which passes the retry number as `n`."""
+    return min(cap, base * 2 ** n) * random.uniform(0.5, 1.5)
+
+def fetch_with_backoff(url: str, timeout: float, max_retries: int = 3,
+                       base: float = 0.25, cap: float = 4.0) -> httpx.Response:
+    """GET via the shared session, retrying only transient failures (429/5xx, network errors)."""
+    for attempt in range(max_retries + 1):
+        try:
+            r = SESSION.get(url, timeout=timeout)
+            if r.status_code not in TRANSIENT_HTTP_STATUS or attempt == max_retries:
+                return r
+            logger.info("Transient HTTP %s, retrying (%d/%d)", r.status_code, attempt + 1, max_retries)
+        except (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError) as e:
+            if attempt == max_retries:
+                raise
+            logger.info("Transient network error, retrying (%d/%d): %.80s", attempt + 1, max_retries, e)
+        time.sleep(_backoff_delay(attempt, base, cap))
+
 # ---------------- YouTube Helpers ----------------
+@functools.lru_cache(maxsize=1024)
 def extract_video_id(url: str) -> str:
-    pats = [r"(?:v=|\/)([0-9A-Za-z_-]{11})(?:[&\?#]|$)", r"youtu\.be\/([0-9A-Za-z_-]{11})"]
-    for p in pats:
-        m = re.search(p, url)
+    for p in _VID_PATS:
+        m = p.search(url)
         if m: return m.group(1)
-    m2 = re.search(r"([0-9A-Za-z_-]{11})", url)
+    m2 = _VID_FALLBACK.search(url)
     if m2: return m2.group(1)
     raise HTTPException(status_code=400, detail="Invalid YouTube URL.")
 
@@ -98,7 +186,7 @@ def try_transcript_api(video_id: str, video_url: Optional[str] = None) -> Option
     - Prefers English, but falls back to any available language.
     """
     try:
-        log("Attempting YouTubeTranscriptApi (free tier optimized)...")
+        logger.info("Attempting YouTubeTranscriptApi (free tier optimized)...")
         transcripts = YouTubeTranscriptApi.list_transcripts(video_id)
 
         # Simplified English detection for faster execution
@@ -118,26 +206,53 @@ def try_transcript_api(video_id: str, video_url: Optional[str] = None) -> Option
         
         for idx, t in enumerate(all_attempts):
             try:
-                log(f"Fetching transcript {idx+1}/{len(all_attempts)}: {t.language} ({t.language_code})")
+                logger.info("Fetching transcript %d/%d: %s (%s)", idx + 1, len(all_attempts), t.language, t.language_code)
                 fetched = t.fetch()
                 if fetched:
                     text = " ".join(seg.get("text", "") for seg in fetched if seg.get("text"))
                     if text.strip():
-                        log(f"✓ Transcript fetched successfully: {t.language}")
+                        logger.info("✓ Transcript fetched successfully: %s", t.language)
                         return text
             except Exception as e:
                 if "no element found" in str(e).lower():
-                    log("Transcript XML empty (likely HLS) — skipping")
+                    logger.info("Transcript XML empty (likely HLS) — skipping")
                     return None
-                log(f"✗ Transcript fetch attempt {idx+1} failed: {str(e)[:80]}")
+                logger.warning("✗ Transcript fetch attempt %d failed: %.80s", idx + 1, e)
 
     except Exception as e:
-        log(f"✗ YouTubeTranscriptApi failed: {str(e)[:100]}")
+        logger.warning("✗ YouTubeTranscriptApi failed: %.100s", e)
 
     return None
 
 
 # ---------------- yt-dlp Wrapper ----------------
+# Idle YoutubeDL instances for metadata probes. Building one re-registers every
+# extractor, so instances are reused and only their player_client args change.
+_YDL_POOL: queue.SimpleQueue = queue.SimpleQueue()
+
+def _probe_strategy(video_url: str, download: bool, ydl_opts: dict, strategy: dict, reusable: bool):
+    """Run a single player_client strategy on a YoutubeDL instance of its own."""
+    logger.info("Trying extraction strategy: %s", strategy["player_client"])
+    if not reusable:
+        youtube_args = {**ydl_opts["extractor_args"]["youtube"], **strategy}
+        opts = {**ydl_opts, "extractor_args": {**ydl_opts["extractor_args"], "youtube": youtube_args}}
+        with yt_dlp.YoutubeDL(opts) as ydl:
+            info = ydl.extract_info(video_url, download=download)
+    else:
+        try:
+            ydl = _YDL_POOL.get_nowait()
+        except queue.Empty:
+            # Deep copy so each instance owns its extractor_args
+            ydl = yt_dlp.YoutubeDL(copy.deepcopy(ydl_opts))
+        try:
+            ydl.params["extractor_args"]["youtube"].update(strategy)
+            info = ydl.extract_info(video_url, download=download)
+        finally:
+            _YDL_POOL.put(ydl)
+    if info and (info.get("title") or info.get("description")):
+        return info
+    return None
+
 def _extract_with_stable_client(video_url: str, download: bool, extra_opts: Optional[dict] = None):
     """Optimized for Render free tier with reduced timeouts and memory usage"""
     ydl_opts = {
@@ -152,6 +267,7 @@ def _extract_with_stable_client(video_url: str, download: bool, extra_opts: Opti
         },
         "retries": 3,  # Increased retries
         "fragment_retries": 3,
+        "retry_sleep_functions": {"http": _backoff_delay, "extractor": _backoff_delay},
         "socket_timeout": YTDLP_SOCKET_TIMEOUT,
         "http_headers": {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
@@ -175,55 +291,116 @@ def _extract_with_stable_client(video_url: str, download: bool, extra_opts: Opti
         {"player_client": ["web_embedded"], "skip": []},  # Added fallback
     ]
     
+    # Hedged probing: start with the first strategy and only add the next one when a probe
+    # fails, or (metadata only) when it is still running after YTDLP_HEDGE_DELAY.
+    # Downloads stay strictly sequential so files are never written twice
+    workers = 1 if download else YTDLP_PROBE_WORKERS
+    # Only the default metadata options are shared through the instance pool
+    reusable = not download and not extra_opts
+    remaining = iter(strategies)
+    pool = ThreadPoolExecutor(max_workers=workers)
+    pending = {}
+
+    def launch_next() -> bool:
+        strategy = next(remaining, None)
+        if strategy is None:
+            return False
+        pending[pool.submit(_probe_strategy, video_url, download, ydl_opts, strategy, reusable)] = strategy
+        return True
+
     last_error = None
-    for idx, strategy in enumerate(strategies):
-        try:
-            log(f"Trying extraction strategy {idx+1}/{len(strategies)}: {strategy['player_client']}")
-            ydl_opts["extractor_args"]["youtube"].update(strategy)
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(video_url, download=download)
-                if info and (info.get("title") or info.get("description")):
-                    log(f"✓ Extraction successful with strategy: {strategy['player_client']}")
-                    return info
-        except Exception as e:
-            error_str = str(e).lower()
-            last_error = e
-            log(f"✗ Strategy {strategy['player_client']} failed: {str(e)[:100]}")
-            
-            # Don't retry on these specific errors
-            if "private video" in error_str or "this video is unavailable" in error_str:
-                raise
-            
-            # Try next strategy
-            if idx < len(strategies) - 1:
-                time.sleep(1)  # Brief pause between strategies
+    hedge = len(strategies) > 1
+    try:
+        launch_next()
+        while pending:
+            timeout = YTDLP_HEDGE_DELAY if hedge and len(pending) < workers else None
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                # Current probes are slow: hedge with the next strategy
+                logger.info("Probe still running after %ss, hedging with next strategy", YTDLP_HEDGE_DELAY)
+                hedge = launch_next()
                 continue
-    
+            for fut in done:
+                strategy = pending.pop(fut)
+                try:
+                    info = fut.result()
+                except Exception as e:
+                    error_str = str(e).lower()
+                    last_error = e
+                    logger.warning("✗ Strategy %s failed: %.100s", strategy["player_client"], e)
+
+                    # Don't retry on these specific errors
+                    if "private video" in error_str or "this video is unavailable" in error_str:
+                        raise
+                    info = None
+                if info:
+                    logger.info("✓ Extraction successful with strategy: %s", strategy["player_client"])
+                    return info
+                # Replace the failed probe with the next strategy
+                hedge = launch_next() and hedge
+    finally:
+        # At most a hedged probe or two is left to finish in the background
+        pool.shutdown(wait=False, cancel_futures=True)
+
     # All strategies failed
     if last_error:
         raise last_error
     raise Exception("All extraction strategies failed")
 
+# Only the fields we read are cached, not yt-dlp's full (format-heavy) info dict
+_INFO_FIELDS = ("title", "description", "uploader", "duration", "view_count",
+                "upload_date", "subtitles", "automatic_captions")
+_INFO_CACHE = TTLCache(maxsize=VIDEO_INFO_CACHE_SIZE, ttl=VIDEO_INFO_CACHE_TTL)
+_INFO_CACHE_LOCK = threading.Lock()
+
+def _get_video_info(video_url: str) -> dict:
+    """yt-dlp metadata for a video, cached per video ID so repeat lookups skip extraction."""
+    vid = extract_video_id(video_url)
+    with _INFO_CACHE_LOCK:
+        info = _INFO_CACHE.get(vid)
+    if info is not None:
+        logger.info("Using cached video info for %s", vid)
+        return info
+    raw = _extract_with_stable_client(video_url, download=False)
+    info = {k: raw[k] for k in _INFO_FIELDS if k in raw}
+    with _INFO_CACHE_LOCK:
+        _INFO_CACHE[vid] = info
+    return info
+
 def _subtitle_to_plain(s: str) -> str:
     s = s.strip()
     if not s: return ""
     try:
         data = json.loads(s)
-        segs = []
         if isinstance(data, dict) and "events" in data:
-            for ev in data["events"]:
-                for sg in ev.get("segs") or []:
-                    t = sg.get("utf8", "").strip()
-                    if t: segs.append(t)
-        if segs: return " ".join(segs)
+            segs = [t for ev in data["events"] for sg in (ev.get("segs") or ())
+                    if (t := sg.get("utf8", "").strip())]
+            if segs: return " ".join(segs)
     except Exception:
         pass
-    lines = [ln.strip() for ln in s.splitlines() if ln and not re.match(r"^(\d+|WEBVTT|-->)", ln)]
-    return " ".join(lines)
+    skip = _VTT_SKIP.match
+    return " ".join([ln.strip() for ln in s.splitlines() if ln and not skip(ln)])
 
-def try_ytdlp_subtitles(video_url: str) -> Optional[str]:
-    """Optimized for Render free tier - prefer English captions with early bailout."""
-    log("Attempting yt_dlp subtitle extraction (optimized)...")
+def _fetch_segment(url: str) -> str:
+    try:
+        rs = fetch_with_backoff(url, timeout=5)  # 5s per segment
+        if rs.status_code == 200:
+            return _subtitle_to_plain(rs.content.decode("utf-8", errors="ignore"))
+    except Exception as e:
+        logger.warning("Segment fetch failed: %s", e)
+    return ""
+
+def _fetch_segments(urls: List[str]) -> List[str]:
+    """Download HLS subtitle segments concurrently, preserving playlist order."""
+    if not urls:
+        return []
+    with ThreadPoolExecutor(max_workers=min(HLS_SEGMENT_WORKERS, len(urls))) as pool:
+        return [t for t in pool.map(_fetch_segment, urls) if t.strip()]
+
+def try_ytdlp_subtitles(video_url: str) -> Tuple[Optional[str], Optional[dict]]:
+    """Optimized for Render free tier - prefer English captions with early bailout.
+    Returns (transcript_or_None, info_or_None) so callers can reuse the fetched metadata."""
+    logger.info("Attempting yt_dlp subtitle extraction (optimized)...")
     start = time.time()
 
     def is_english_label(label: str) -> bool:
@@ -232,27 +409,28 @@ def try_ytdlp_subtitles(video_url: str) -> Optional[str]:
         lbl = label.lower()
         return (
             "english" in lbl or
-            re.match(r"^en([\-_][a-z]+)?$", lbl) is not None or
+            _EN_LANG_RE.match(lbl) is not None or
             lbl.startswith("en") or
             lbl == "eng"
         )
 
+    info = None
     try:
-        info = _extract_with_stable_client(video_url, download=False)
+        info = _get_video_info(video_url)
         subs = info.get("subtitles") or {}
         auto = info.get("automatic_captions") or {}
 
-        all_tracks = {**subs, **auto}
-
         english_candidates = []
         other_candidates = []
 
-        # Split tracks into English vs non-English
-        for lang, items in all_tracks.items():
+        # Split tracks into English vs non-English (manual subs first, then auto captions)
+        for lang, items in itertools.chain(subs.items(), auto.items()):
             if not isinstance(items, list):
                 continue
             if is_english_label(lang):
                 english_candidates.extend(items)
+                if len(english_candidates) >= 3:
+                    break  # Enough English candidates; no need to scan the remaining languages
             else:
                 other_candidates.extend(items)
 
@@ -263,14 +441,14 @@ def try_ytdlp_subtitles(video_url: str) -> Optional[str]:
             candidates = other_candidates[:2]  # Limit to first 2
         else:
             candidates = []
-            for v in list(all_tracks.values())[:2]:  # Max 2 fallback attempts
+            for v in itertools.islice(itertools.chain(subs.values(), auto.values()), 2):  # Max 2 fallback attempts
                 if isinstance(v, list):
                     candidates.extend(v[:1])
 
         for idx, cand in enumerate(candidates):
             # Early timeout check
             if time.time() - start > REQUEST_TIMEOUT * 0.8:  # Use 80% of timeout
-                log("Subtitle extraction timeout approaching, stopping early")
+                logger.info("Subtitle extraction timeout approaching, stopping early")
                 break
             
             url = cand.get("url")
@@ -278,83 +456,120 @@ def try_ytdlp_subtitles(video_url: str) -> Optional[str]:
                 continue
             
             try:
-                headers = {
-                    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
-                    "Accept-Language": "en-US,en;q=0.9",
-                }
-                r = requests.get(url, timeout=REQUEST_TIMEOUT // 2, headers=headers)  # Halve timeout per request
+                r = fetch_with_backoff(url, timeout=REQUEST_TIMEOUT // 2)  # Halve timeout per request
                 if r.status_code == 200 and r.text.strip():
                     text = r.text
 
                     # HLS playlist?
                     if text.lstrip().startswith("#EXTM3U"):
-                        log("Detected HLS (.m3u8) subtitle playlist; fetching limited segments...")
+                        logger.info("Detected HLS (.m3u8) subtitle playlist; fetching limited segments...")
                         lines = text.splitlines()
                         segs = [
                             urllib.parse.urljoin(url, ln.strip())
                             for ln in lines if ln and not ln.startswith("#")
                         ]
-                        collected = []
                         # Limit segments for memory efficiency
                         max_segs = min(HLS_SEGMENT_LIMIT, 20)
-                        for seg in segs[:max_segs]:
-                            try:
-                                rs = requests.get(seg, timeout=5)  # 5s per segment
-                                if rs.status_code == 200:
-                                    content = rs.content.decode("utf-8", errors="ignore")
-                                    cleaned = _subtitle_to_plain(content)
-                                    if cleaned.strip():
-                                        collected.append(cleaned)
-                            except Exception as e:
-                                log(f"Segment fetch failed: {e}")
+                        collected = _fetch_segments(segs[:max_segs])
                         if collected:
-                            log(f"✓ Fetched {len(collected)} HLS subtitle segments")
-                            return " ".join(collected)
+                            logger.info("✓ Fetched %d HLS subtitle segments", len(collected))
+                            return " ".join(collected), info
                         continue
 
                     # Normal VTT/SRT text
                     cleaned = _subtitle_to_plain(text)
                     if cleaned.strip():
-                        log(f"✓ yt_dlp subtitle fetch succeeded (candidate {idx+1})")
-                        return cleaned
+                        logger.info("✓ yt_dlp subtitle fetch succeeded (candidate %d)", idx + 1)
+                        return cleaned, info
             except Exception as e:
-                log(f"✗ Subtitle fetch attempt {idx+1} failed: {str(e)[:80]}")
+                logger.warning("✗ Subtitle fetch attempt %d failed: %.80s", idx + 1, e)
                 continue
 
-        log("No usable subtitles found via yt_dlp")
+        logger.info("No usable subtitles found via yt_dlp")
     except Exception as e:
-        log(f"✗ yt_dlp subtitle extraction failed: {str(e)[:100]}")
+        logger.warning("✗ yt_dlp subtitle extraction failed: %.100s", e)
 
-    return None
+    return None, info
 
 
 # ---------------- Master Transcript Logic ----------------
+_TRANSCRIPT_CACHE = TTLCache(maxsize=TRANSCRIPT_CACHE_SIZE, ttl=TRANSCRIPT_CACHE_TTL)
+_TRANSCRIPT_CACHE_LOCK = threading.Lock()
+_TRANSCRIPT_INFLIGHT: dict = {}  # video ID -> Future with the outcome of the extraction in progress
+_TRANSCRIPT_DISK = diskcache.Cache(os.path.join(tempfile.gettempdir(), "yt_cache"))
+atexit.register(_TRANSCRIPT_DISK.close)
+
 def extract_transcript_from_youtube(video_url: str) -> str:
-    log(f"extract_transcript_from_youtube START for {video_url}")
     vid = extract_video_id(video_url)
+    with _TRANSCRIPT_CACHE_LOCK:
+        transcript = _TRANSCRIPT_CACHE.get(vid)
+        if transcript is None:
+            outcome = _TRANSCRIPT_INFLIGHT.get(vid)
+            owner = outcome is None
+            if owner:
+                outcome = _TRANSCRIPT_INFLIGHT[vid] = Future()
+    if transcript is not None:
+        logger.info("Using cached transcript for %s", vid)
+        return transcript
+    if not owner:
+        # Same video already being extracted: share that result (or error), cached or not
+        logger.info("Waiting on in-flight extraction for %s", vid)
+        return outcome.result()
+
+    try:
+        # Second tier: transcripts cached on disk by an earlier worker process
+        transcript = _TRANSCRIPT_DISK.get(vid)
+        from_disk = transcript is not None
+        if from_disk:
+            logger.info("Using disk-cached transcript for %s", vid)
+            from_captions = True
+        else:
+            transcript, from_captions = _extract_transcript_uncached(video_url, vid)
+    except BaseException as e:
+        with _TRANSCRIPT_CACHE_LOCK:
+            _TRANSCRIPT_INFLIGHT.pop(vid, None)
+        outcome.set_exception(e)
+        raise
+
+    # Cache writes and the in-flight pop happen together so no request can slip between them.
+    # Metadata-only fallbacks may be caused by temporary blocking, so only cache real captions
+    with _TRANSCRIPT_CACHE_LOCK:
+        if from_captions:
+            _TRANSCRIPT_CACHE[vid] = transcript
+            if not from_disk:
+                _TRANSCRIPT_DISK.set(vid, transcript, expire=TRANSCRIPT_DISK_TTL)
+        _TRANSCRIPT_INFLIGHT.pop(vid, None)
+    outcome.set_result(transcript)
+    return transcript
+
+def _extract_transcript_uncached(video_url: str, vid: str) -> Tuple[str, bool]:
+    """Returns (text, from_captions); from_captions is False for metadata-only fallbacks."""
+    logger.info("extract_transcript_from_youtube START for %s", video_url)
+    info = None
     transcript = try_transcript_api(vid, video_url)
     if not transcript:
-        transcript = try_ytdlp_subtitles(video_url)
+        transcript, info = try_ytdlp_subtitles(video_url)
+    from_captions = bool(transcript)
     if not transcript:
-        log("No subtitles available — using title and description as fallback.")
+        logger.info("No subtitles available — using title and description as fallback.")
         try:
-            info = _extract_with_stable_client(video_url, download=False)
+            info = info or _get_video_info(video_url)
             title = info.get("title", "")
             desc = info.get("description", "")
             if title or desc:
                 transcript = f"Title: {title}\n\nDescription:\n{desc}"
-                log(f"Using metadata fallback: title='{title[:50]}...', desc_length={len(desc)}")
+                logger.info("Using metadata fallback: title='%.50s...', desc_length=%d", title, len(desc))
         except Exception as e:
-            log(f"Metadata fetch failed: {e}")
+            logger.warning("Metadata fetch failed: %s", e)
             transcript = ""
 
     if transcript and transcript.strip():
-        return transcript
+        return transcript, from_captions
     
     # Last attempt: try to get any metadata
     try:
-        log("Final attempt: fetching video metadata...")
-        info = _extract_with_stable_client(video_url, download=False)
+        logger.info("Final attempt: fetching video metadata...")
+        info = info or _get_video_info(video_url)
         title = info.get("title", "No title available")
         desc = info.get("description", "No description available")
         uploader = info.get("uploader", "Unknown")
@@ -404,10 +619,10 @@ Description:
 Note: Transcript/subtitles were not available for this video. This summary is based on the video metadata only."""
         
         if fallback_text.strip():
-            log("Successfully retrieved metadata for summarization")
-            return fallback_text
+            logger.info("Successfully retrieved metadata for summarization")
+            return fallback_text, False
     except Exception as e:
-        log(f"Final metadata fetch also failed: {e}")
+        logger.warning("Final metadata fetch also failed: %s", e)
     
     raise HTTPException(
         status_code=400, 
@@ -415,63 +630,27 @@ Note: Transcript/subtitles were not available for this video. This summary is ba
     )
 
 # ---------------- PDF Extraction ----------------
+def _write_upload(src, fd: int) -> None:
+    """Copy an upload to a raw fd in 1MB chunks (no Python write buffer); the caller closes it."""
+    while chunk := src.read(1 << 20):
+        view = memoryview(chunk)
+        while view:  # os.write may accept fewer bytes than offered
+            view = view[os.write(fd, view):]
+
 def extract_pdf_text(pdf_path: str) -> str:
     try:
+        parts: List[str] = []
         with pdfplumber.open(pdf_path) as pdf:
-            return "\n".join((p.extract_text() or "") for p in pdf.pages).strip()
+            for page in pdf.pages:
+                parts.append(page.extract_text() or "")
+                page.close()  # Drop the page's cached layout objects before parsing the next one
+        return "\n".join(parts).strip()
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"PDF extraction failed: {e}")
 
 # ---------------- Summarization ----------------
-def summarize_via_gemini(text: str, summary_type: str = "short",
-                         bullet_count: Optional[int] = None, target_lang: str = "en") -> str:
-    """
-    Smart Summarizer v1.4.0 - Optimized for Speed & Quality
-    - Faster processing with optimized chunking
-    - Better quality summaries with improved prompts
-    - Smart caching and response optimization
-    """
-
-    if not text:
-        return "No text available to summarize."
-    if not GEMINI_KEY:
-        return text[:800] + "..." * (len(text) > 800)
-
-    summary_type = (summary_type or "short").strip().lower()
-    if summary_type not in {"short", "bullet", "detailed"}:
-        log(f"Unknown summary_type '{summary_type}', defaulting to 'short'")
-        summary_type = "short"
-
-    model = genai.GenerativeModel("gemini-2.0-flash")
-
-    # -------- Optimized Chunking for Free Tier --------
-    text = text.strip()
-    text_len = len(text)
-
-    MAX_SAFE_CHUNK = 80000  # Reduced for 512MB RAM constraint
-    overlap = 300  # Reduced overlap
-    max_chunks = 2  # Limit to 2 chunks max
-
-    if text_len <= MAX_SAFE_CHUNK:
-        chunks = [text]
-    else:
-        chunks = []
-        step = MAX_SAFE_CHUNK - overlap
-        for i in range(0, text_len, step):
-            chunk = text[i:i + MAX_SAFE_CHUNK]
-            chunks.append(chunk)
-            if len(chunks) >= max_chunks:
-                break
-
-    log(f"[Chunker v1.4.0] Processing {len(chunks)} chunk(s) (~{MAX_SAFE_CHUNK} chars each, total={text_len})")
-
-    partials: List[str] = []
-
-    for idx, chunk in enumerate(chunks, start=1):
-        try:
-            if summary_type == "bullet":
-                bc = int(bullet_count) if bullet_count else 10
-                prompt = f"""You are a professional expert summarizer. Create a comprehensive organized summary with MAIN TOPICS, SUB-TOPICS, and detailed explanations.
+# Per-chunk prompt templates, filled with str.format(chunk=..., bc=...)
+_PROMPT_BULLET = """You are a professional expert summarizer. Create a comprehensive organized summary with MAIN TOPICS, SUB-TOPICS, and detailed explanations.
 
 STRUCTURE REQUIREMENTS - FOLLOW EXACTLY:
 1. Start with 1-2 introductory paragraphs explaining the main topic/theme (simple, easy language)
@@ -496,10 +675,8 @@ CRITICAL - Complete Explanation:
 
 Content:
 {chunk}"""
-                max_tokens = 2500
 
-            elif summary_type == "comprehensive":
-                prompt = f"""Create an extremely detailed and comprehensive summary where EVERY important point is explained thoroughly.
+_PROMPT_COMPREHENSIVE = """Create an extremely detailed and comprehensive summary where EVERY important point is explained thoroughly.
 
 Format requirements:
 - Start with a brief overview
@@ -515,10 +692,8 @@ Format requirements:
 
 Content:
 {chunk}"""
-                max_tokens = 3000
 
-            elif summary_type == "detailed":
-                prompt = f"""Create an extremely detailed and comprehensive summary with thorough explanations for every point.
+_PROMPT_DETAILED = """Create an extremely detailed and comprehensive summary with thorough explanations for every point.
 
 Format requirements:
 - Use ## for main sections and ### for subsections
@@ -532,10 +707,8 @@ Format requirements:
 
 Content:
 {chunk}"""
-                max_tokens = 3000
 
-            else:  # short
-                prompt = f"""Write a concise professional summary in 3-4 clear paragraphs.
+_PROMPT_SHORT = """Write a concise professional summary in 3-4 clear paragraphs.
 
 Guidelines:
 - Each paragraph should focus on one main idea
@@ -546,31 +719,149 @@ Guidelines:
 
 Content:
 {chunk}"""
-                max_tokens = 1200
 
+# summary_type -> (template, max_output_tokens)
+_PROMPT_MAP = {
+    "bullet": (_PROMPT_BULLET, 2500),
+    "comprehensive": (_PROMPT_COMPREHENSIVE, 3000),
+    "detailed": (_PROMPT_DETAILED, 3000),
+    "short": (_PROMPT_SHORT, 1200),
+}
+
+# LRU of formatted summaries keyed by (content hash, summary_type, bullet_count, target_lang)
+_SUMMARY_CACHE: "OrderedDict[tuple, str]" = OrderedDict()
+_SUMMARY_CACHE_LOCK = threading.Lock()
+_SUMMARY_STATS = {"hits": 0, "misses": 0}  # Reported by /health; updated under the lock
+
+def summarize_via_gemini(text: str, summary_type: str = "short",
+                         bullet_count: Optional[int] = None, target_lang: str = "en") -> str:
+    """
+    Smart Summarizer v1.4.0 - Optimized for Speed & Quality
+    - Faster processing with optimized chunking
+    - Better quality summaries with improved prompts
+    - Smart caching and response optimization
+    """
+
+    if not text:
+        return "No text available to summarize."
+    if not GEMINI_KEY:
+        # Raw text is still inserted as HTML by the frontend, so escape it like formatted output
+        return text[:800].translate(_ESCAPE) + "..." * (len(text) > 800)
+
+    summary_type = (summary_type or "short").strip().lower()
+    if summary_type not in {"short", "bullet", "detailed"}:
+        logger.info("Unknown summary_type '%s', defaulting to 'short'", summary_type)
+        summary_type = "short"
+
+    text = text.strip()
+    text_len = len(text)
+
+    # Already-short inputs (e.g. metadata fallbacks) aren't worth an LLM round-trip
+    if text_len < SHORT_BYPASS_CHARS and summary_type == "short":
+        logger.info("Input is only %d chars - skipping Gemini", text_len)
+        return format_summary_output(text, summary_type)
+
+    key = (hashlib.blake2b(text.encode(), digest_size=16).hexdigest(), summary_type, bullet_count, target_lang)
+    with _SUMMARY_CACHE_LOCK:
+        cached = _SUMMARY_CACHE.get(key)
+        if cached is not None:
+            _SUMMARY_CACHE.move_to_end(key)
+            _SUMMARY_STATS["hits"] += 1
+        else:
+            _SUMMARY_STATS["misses"] += 1
+    if cached is not None:
+        logger.info("✅ Returning cached summary")
+        return cached
+
+    summary, complete = _generate_summary(text, summary_type, bullet_count)
+    if summary is None:
+        # No AI summary generated - format the raw text as metadata
+        logger.warning("⚠ No AI summary generated - returning formatted metadata")
+        return format_summary_output(text[:1500], "short")
+    if not complete:
+        # A chunk or the merge failed (often transiently); let the next request retry
+        logger.warning("⚠ Returning degraded summary without caching it")
+        return summary
+
+    with _SUMMARY_CACHE_LOCK:
+        _SUMMARY_CACHE[key] = summary
+        while len(_SUMMARY_CACHE) > SUMMARY_CACHE_SIZE:
+            _SUMMARY_CACHE.popitem(last=False)
+    return summary
+
+def _generate_summary(text: str, summary_type: str, bullet_count: Optional[int]) -> Tuple[Optional[str], bool]:
+    """
+    Run the chunked Gemini summarization.
+    Returns (summary, complete); summary is None if no chunk produced one, and complete
+    is False when a chunk or the merge failed and the result is a partial fallback.
+    """
+    model = genai.GenerativeModel("gemini-2.0-flash")
+
+    # -------- Optimized Chunking for Free Tier --------
+    text_len = len(text)
+
+    MAX_SAFE_CHUNK = CHUNK_CHARS  # Reduced for 512MB RAM constraint
+    overlap = CHUNK_OVERLAP_CHARS
+    max_chunks = 2  # Limit to 2 chunks max
+
+    if text_len <= MAX_SAFE_CHUNK:
+        chunks = [text]
+    else:
+        chunks = []
+        start = 0
+        while start < text_len and len(chunks) < max_chunks:
+            end = min(start + MAX_SAFE_CHUNK, text_len)
+            if end < text_len:
+                # Cut on whitespace so no word straddles two chunks
+                cut = max(text.rfind(" ", start + overlap, end), text.rfind("\n", start + overlap, end))
+                if cut > start + overlap:
+                    end = cut
+            chunks.append(text[start:end])
+            if end >= text_len:
+                break
+            # Start the overlap on a word boundary too
+            ws = text.find(" ", end - overlap, end)
+            start = ws + 1 if ws != -1 else end - overlap
+
+    logger.info("[Chunker v1.4.0] Processing %d chunk(s) (≤%d chars each, total=%d chars)",
+                len(chunks), MAX_SAFE_CHUNK, text_len)
+
+    template, max_tokens = _PROMPT_MAP[summary_type]
+    bc = int(bullet_count) if bullet_count else 10
+
+    def _summarize_one_chunk(idx: int, chunk: str) -> str:
+        try:
+            prompt = template.format(chunk=chunk, bc=bc)
             resp = model.generate_content(
                 prompt,
                 generation_config={"temperature": 0.3, "max_output_tokens": max_tokens, "top_p": 0.9}
             )
             result = _safe_gemini_text(resp)
             if result.strip():
-                partials.append(result)
-                log(f"✔ Chunk {idx}/{len(chunks)} completed ({len(chunk)} chars)")
-            else:
-                log(f"⚠ Empty response for chunk {idx}")
+                logger.info("✔ Chunk %d/%d completed (%d chars)", idx, len(chunks), len(chunk))
+                return result
+            logger.warning("⚠ Empty response for chunk %d", idx)
         except Exception as e:
-            log(f"Error processing chunk {idx}: {e}")
-            continue
+            logger.error("Error processing chunk %d: %s", idx, e)
+        return ""
+
+    # Chunks are independent requests, so dispatch them concurrently;
+    # map() keeps the results in chunk order for the merge step
+    with ThreadPoolExecutor(max_workers=len(chunks)) as pool:
+        results = pool.map(_summarize_one_chunk, range(1, len(chunks) + 1), chunks)
+        partials: List[str] = [r for r in results if r]
+    all_chunks_ok = len(partials) == len(chunks)
+    # Chunk copies (up to 80K chars each) aren't needed for the merge; free them
+    # now rather than holding them through another Gemini round-trip
+    chunks.clear()
 
     if not partials:
-        # No AI summary generated - format the raw text as metadata
-        log("⚠ No AI summary generated - returning formatted metadata")
-        return format_summary_output(text[:1500], "short")
+        return None, False
 
     # -------- Skip merge for single chunk --------
     if len(partials) == 1:
-        log("✅ Summary generated successfully")
-        return format_summary_output(partials[0], summary_type)
+        logger.info("✅ Summary generated successfully")
+        return format_summary_output(partials[0], summary_type), all_chunks_ok
 
     # -------- Merge multiple chunks --------
     combined = "\n\n".join(partials)
@@ -643,180 +934,205 @@ Partial summaries:
         final_summary = _safe_gemini_text(resp).strip()
 
         if final_summary:
-            log("✅ Final summary merged and optimized")
-            return format_summary_output(final_summary, summary_type)
+            logger.info("✅ Final summary merged and optimized")
+            return format_summary_output(final_summary, summary_type), all_chunks_ok
 
     except Exception as e:
-        log(f"Merge error: {e}")
-        return format_summary_output("\n\n".join(partials), summary_type)
+        logger.error("Merge error: %s", e)
+        return format_summary_output("\n\n".join(partials), summary_type), False
 
-    return format_summary_output("\n\n".join(partials[:3]), summary_type)
+    return format_summary_output("\n\n".join(partials[:3]), summary_type), False
 
 # ----------- HTML Styling Formatter -----------
+def _write_list(buf: io.StringIO, items: List[str]) -> None:
+    # One C-level join over the raw items instead of three writes per item
+    buf.write("<ul><li>")
+    buf.write("</li><li>".join(items))
+    buf.write("</li></ul>\n")
+
 def format_summary_output(text: str, summary_type: str) -> str:
-    """Format summary text into clean, readable HTML"""
+    """Format summary text into clean, readable HTML in a single pass over its lines"""
     text = text.strip()
     if not text:
         return ""
 
-    # Convert markdown bold to HTML
-    text = re.sub(r"\*\*(.+?)\*\*", r"<strong>\1</strong>", text)
+    # Markdown bold never spans lines, so it is converted per line as we go, after the
+    # line is HTML-escaped; only tags generated here survive into the output.
+    # Bold conversion never adds edge whitespace, so bullet/short lines are stripped and
+    # blank ones dropped up front; detailed lines strip after their header rewrites.
+    bold = _BOLD_RE.sub
     
     if summary_type == "bullet":
-        lines = text.splitlines()
-        html_parts = []
+        buf = io.StringIO()
         current_list = []
         in_intro = True
         
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
+        for line in filter(None, map(str.strip, text.splitlines())):
+            line = bold(r"<strong>\1</strong>", line.translate(_ESCAPE))
             
             # Check for main topic headers (bold text with colon at end)
-            if re.match(r"^<strong>.+:</strong>$", line):
+            if _BOLD_HEADER_LINE_RE.match(line):
                 # Close any open list
                 if current_list:
-                    html_parts.append("<ul>" + "".join(f"<li>{item}</li>" for item in current_list) + "</ul>")
+                    _write_list(buf, current_list)
                     current_list = []
                 in_intro = False
                 # Add as section header
-                html_parts.append(f"<h4>{line.replace('<strong>', '').replace('</strong>', '')}</h4>")
+                buf.write(f"<h4>{line.replace('<strong>', '').replace('</strong>', '')}</h4>\n")
                 
             # Bullet points
-            elif line.startswith("-") or line.startswith("•") or line.startswith("*"):
+            elif line.startswith(("-", "•", "*")):
                 in_intro = False
-                bullet_text = re.sub(r"^[-•*]\s*", "", line)
+                bullet_text = line[1:].lstrip()
                 current_list.append(bullet_text)
                 
             # Regular paragraphs (intro text, etc)
             else:
                 # Close any open list
                 if current_list:
-                    html_parts.append("<ul>" + "".join(f"<li>{item}</li>" for item in current_list) + "</ul>")
+                    _write_list(buf, current_list)
                     current_list = []
-                html_parts.append(f"<p>{line}</p>")
+                buf.write(f"<p>{line}</p>\n")
         
         # Close final list if open
         if current_list:
-            html_parts.append("<ul>" + "".join(f"<li>{item}</li>" for item in current_list) + "</ul>")
+            _write_list(buf, current_list)
         
-        return "\n".join(html_parts)
+        # Drop the trailing newline so output matches the "\n".join() layout
+        return buf.getvalue()[:-1]
 
     elif summary_type in ["detailed", "comprehensive"]:
-        # Convert markdown headers
-        text = re.sub(r"^###\s*(.+)$", r"<h4>\1</h4>", text, flags=re.MULTILINE)
-        text = re.sub(r"^##\s*(.+)$", r"<h3>\1</h3>", text, flags=re.MULTILINE)
-        text = re.sub(r"^#\s*(.+)$", r"<h3>\1</h3>", text, flags=re.MULTILINE)
-        
-        # Convert strong tags with colons to headers
-        text = re.sub(r"<strong>([^<]+:)</strong>", r"<h4>\1</h4>", text)
-        
-        # Process line by line
-        lines = text.splitlines()
-        html_parts = []
+        buf = io.StringIO()
         current_list = []
         
-        for line in lines:
+        for line in text.splitlines():
+            line = bold(r"<strong>\1</strong>", line.translate(_ESCAPE))
+            # Convert markdown headers, then strong tags with colons to headers
+            for pattern, repl in _DETAILED_HEADER_SUBS:
+                line = pattern.sub(repl, line)
             line = line.strip()
             if not line:
                 continue
                 
             # Already formatted headers
-            if line.startswith("<h") or line.startswith("</"):
+            if line.startswith("<h"):
                 if current_list:
-                    html_parts.append("<ul>" + "".join(f"<li>{item}</li>" for item in current_list) + "</ul>")
+                    _write_list(buf, current_list)
                     current_list = []
-                html_parts.append(line)
+                buf.write(line)
+                buf.write("\n")
                 
             # Bullet points
-            elif re.match(r"^[-*•]\s", line):
-                bullet = re.sub(r"^[-*•]\s*", "", line)
-                current_list.append(bullet)
+            elif (m := _BULLET_RE.match(line)):
+                current_list.append(m.group(1))
                 
             # Regular paragraphs
             else:
                 if current_list:
-                    html_parts.append("<ul>" + "".join(f"<li>{item}</li>" for item in current_list) + "</ul>")
+                    _write_list(buf, current_list)
                     current_list = []
-                html_parts.append(f"<p>{line}</p>")
+                buf.write(f"<p>{line}</p>\n")
         
         # Close final list
         if current_list:
-            html_parts.append("<ul>" + "".join(f"<li>{item}</li>" for item in current_list) + "</ul>")
+            _write_list(buf, current_list)
         
-        return "\n".join(html_parts)
+        return buf.getvalue()[:-1]
 
     else:  # short summary
-        lines = text.splitlines()
-        html_parts = []
-        
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-            
-            # Headers/metadata (Video Title:, Description:, etc)
-            if re.match(r"^(Video Title|Title|Uploader|Duration|Views|Upload Date|Description|Note):", line):
-                html_parts.append(f"<h4>{line}</h4>")
-            # Regular text
-            else:
-                html_parts.append(f"<p>{line}</p>")
-        
-        # Group consecutive paragraphs
-        result = []
+        buf = io.StringIO()
         para_buffer = []
+        # Bound once; para_buffer is cleared in place so the cached append stays valid
+        write, para_append = buf.write, para_buffer.append
         
-        for part in html_parts:
-            if part.startswith("<h4>"):
+        for line in filter(None, map(str.strip, text.splitlines())):
+            line = bold(r"<strong>\1</strong>", line.translate(_ESCAPE))
+            
+            # Headers/metadata (Video Title:, Description:, etc) close the current paragraph
+            if line.startswith(_HEADER_PREFIXES):
                 if para_buffer:
-                    result.append("<p>" + " ".join(p.replace("<p>", "").replace("</p>", "") for p in para_buffer) + "</p>")
-                    para_buffer = []
-                result.append(part)
-            elif part.startswith("<p>"):
-                para_buffer.append(part)
+                    write(f"<p>{' '.join(para_buffer)}</p>\n")
+                    para_buffer.clear()
+                write(f"<h4>{line}</h4>\n")
+            # Regular text: group consecutive lines into one paragraph
+            else:
+                para_append(line)
         
         if para_buffer:
-            result.append("<p>" + " ".join(p.replace("<p>", "").replace("</p>", "") for p in para_buffer) + "</p>")
+            write(f"<p>{' '.join(para_buffer)}</p>\n")
         
-        return "\n".join(result)
+        return buf.getvalue()[:-1]
     
 
+# Lowercased error substrings -> user-facing message, checked in order
+_RATE_LIMIT_MSG = "YouTube is rate-limiting requests. Please wait a few minutes and try again."
+_BOT_MSG = "YouTube detected automated access. This usually resolves itself after a few minutes. Try again shortly, or use a different video."
+_PRIVATE_MSG = "This video is private, unavailable, or age-restricted and cannot be accessed."
+_ERROR_MAP = (
+    ("http error 429", _RATE_LIMIT_MSG),
+    ("too many requests", _RATE_LIMIT_MSG),
+    ("sign in", _BOT_MSG),
+    ("bot", _BOT_MSG),
+    ("private video", _PRIVATE_MSG),
+    ("unavailable", _PRIVATE_MSG),
+    ("all extraction strategies failed", "Unable to access this video. YouTube may be blocking automated requests. Please try again in a few minutes or use a different video."),
+)
+
+# ---------------- Static Assets ----------------
+# The index page never changes at runtime, so it is read into memory once.
+# CSS/JS live in static/ and are served by StaticFiles (ETag/Last-Modified, ranges);
+# only that directory is mounted so main.py and .env are never reachable.
+_BASE = Path(__file__).parent
+_INDEX_BYTES = (_BASE / "index.html").read_bytes()
+_INDEX_ETAG = f'"{hashlib.md5(_INDEX_BYTES, usedforsecurity=False).hexdigest()}"'
+_INDEX_HEADERS = {"ETag": _INDEX_ETAG, "Cache-Control": "public, max-age=3600"}
+
+app.mount("/assets", StaticFiles(directory=_BASE / "static"), name="assets")
+
 # ---------------- Endpoints ----------------
-@app.get("/")
-async def root():
-    return FileResponse(Path(__file__).parent / "index.html", media_type="text/html")
+_BLOCKING_LIMITER: Optional[CapacityLimiter] = None
 
-@app.get("/styles.css")
-async def serve_css():
-    return FileResponse(Path(__file__).parent / "styles.css", media_type="text/css")
+async def _run_blocking(func, *args):
+    """Run a blocking call in a worker thread, at most MAX_CONCURRENT_REQUESTS at a time."""
+    global _BLOCKING_LIMITER
+    # Created on first use so it binds to the running event loop
+    if _BLOCKING_LIMITER is None:
+        _BLOCKING_LIMITER = CapacityLimiter(MAX_CONCURRENT_REQUESTS)
+    return await to_thread.run_sync(func, *args, limiter=_BLOCKING_LIMITER)
 
-@app.get("/script.js")
-async def serve_js():
-    return FileResponse(Path(__file__).parent / "script.js", media_type="application/javascript")
+@app.get("/")
+async def root(request: Request):
+    # Empty 304 if the browser already has this version
+    if request.headers.get("if-none-match") == _INDEX_ETAG:
+        return Response(status_code=304, headers=_INDEX_HEADERS)
+    return Response(_INDEX_BYTES, media_type="text/html", headers=_INDEX_HEADERS)
+
+# Everything but the cache telemetry is fixed once the module has loaded
+_HEALTH_STATIC = {
+    "status": "ok",
+    "version": "1.3.0",
+    "gemini_configured": bool(GEMINI_KEY),
+    "features": (
+        "YouTube bot detection bypass",
+        "Multiple extraction strategies",
+        "Enhanced error handling",
+        "Improved formatting"
+    ),
+}
 
 @app.get("/health")
 async def health():
-    return {
-        "status": "ok",
-        "version": "1.3.0",
-        "gemini_configured": bool(GEMINI_KEY),
-        "features": [
-            "YouTube bot detection bypass",
-            "Multiple extraction strategies",
-            "Enhanced error handling",
-            "Improved formatting"
-        ]
-    }
+    return {**_HEALTH_STATIC, "summary_cache": {**_SUMMARY_STATS, "size": len(_SUMMARY_CACHE)}}
 
-@app.post("/summarize/youtube")
+@app.post("/summarize/youtube", response_model=None)
 async def summarize_youtube(video_url: str = Form(...),
                             summary_type: str = Form("short"),
                             bullet_count: Optional[int] = Form(None),
                             target_lang: str = Form("en")):
     try:
-        log(f"Processing YouTube: {video_url[:50]}... ({summary_type})")
-        transcript = extract_transcript_from_youtube(video_url)
+        logger.info("Processing YouTube: %.50s... (%s)", video_url, summary_type)
+        # yt-dlp / Gemini calls block, so run them off the event loop
+        transcript = await _run_blocking(extract_transcript_from_youtube, video_url)
         
         if not transcript.strip():
             raise HTTPException(
@@ -827,10 +1143,11 @@ async def summarize_youtube(video_url: str = Form(...),
         # Check if we're using fallback metadata
         is_metadata_only = "Note: Transcript/subtitles were not available" in transcript
         
-        log(f"Generating summary... (metadata_only={is_metadata_only})")
-        final = summarize_via_gemini(transcript, summary_type, bullet_count, "en")
+        logger.info("Generating summary... (metadata_only=%s)", is_metadata_only)
+        final = await _run_blocking(summarize_via_gemini, transcript, summary_type, bullet_count, "en")
         
-        return {
+        # Returned as a Response so FastAPI skips its jsonable_encoder walk of the dict
+        return ORJSONResponse({
             "success": True, 
             "summary": final, 
             "video_url": video_url,
@@ -838,60 +1155,61 @@ async def summarize_youtube(video_url: str = Form(...),
             "transcript_length": len(transcript),
             "metadata_only": is_metadata_only,
             "warning": "This summary is based on video metadata only (no transcript available)" if is_metadata_only else None
-        }
+        })
     except HTTPException:
         raise
     except Exception as e:
-        log(f"Error in YouTube summarization: {e}")
+        logger.error("Error in YouTube summarization: %s", e)
         error_message = str(e)
         
-        # Handle specific error cases
-        if "HTTP Error 429" in error_message or "Too Many Requests" in error_message:
-            error_message = "YouTube is rate-limiting requests. Please wait a few minutes and try again."
-        elif "sign in" in error_message.lower() or "bot" in error_message.lower():
-            error_message = "YouTube detected automated access. This usually resolves itself after a few minutes. Try again shortly, or use a different video."
-        elif "Private video" in error_message or "unavailable" in error_message.lower():
-            error_message = "This video is private, unavailable, or age-restricted and cannot be accessed."
-        elif "Video unavailable" in error_message:
-            error_message = "This video is not available. It may have been deleted or made private."
-        elif "All extraction strategies failed" in error_message:
-            error_message = "Unable to access this video. YouTube may be blocking automated requests. Please try again in a few minutes or use a different video."
+        # Handle specific error cases (first matching needle wins)
+        em_l = error_message.lower()
+        for needle, msg in _ERROR_MAP:
+            if needle in em_l:
+                error_message = msg
+                break
         
         raise HTTPException(status_code=500, detail=error_message)
 
-@app.post("/summarize/pdf")
+@app.post("/summarize/pdf", response_model=None)
 async def summarize_pdf(file: UploadFile = File(...),
                         summary_type: str = Form("short"),
                         bullet_count: Optional[int] = Form(None),
                         target_lang: str = Form("en")):
-    tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".pdf")
+    fd = tmp_path = None
     try:
-        content = await file.read()
-        tmp.write(content)
-        tmp.close()
+        fd, tmp_path = tempfile.mkstemp(suffix=".pdf")
+        # Stream the upload to disk in 1MB chunks instead of reading it all into memory;
+        # the fd is closed before parsing so pdfplumber can reopen it on any OS
+        await _run_blocking(_write_upload, file.file, fd)
+        os.close(fd)
+        fd = None
         
-        log(f"Processing PDF: {file.filename} ({summary_type})")
-        text = extract_pdf_text(tmp.name)
+        logger.info("Processing PDF: %s (%s)", file.filename, summary_type)
+        text = await _run_blocking(extract_pdf_text, tmp_path)
         if not text.strip():
             raise HTTPException(status_code=400, detail="No text found in PDF.")
         
-        log("Generating summary...")
-        final = summarize_via_gemini(text, summary_type, bullet_count, "en")
+        logger.info("Generating summary...")
+        final = await _run_blocking(summarize_via_gemini, text, summary_type, bullet_count, "en")
         
-        return {
+        return ORJSONResponse({
             "success": True, 
             "summary": final, 
             "filename": file.filename,
             "summary_type": summary_type,
             "text_length": len(text)
-        }
+        })
     except HTTPException:
         raise
     except Exception as e:
-        log(f"Error in PDF summarization: {e}")
+        logger.error("Error in PDF summarization: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
     finally:
-        os.unlink(tmp.name)
+        if fd is not None:
+            os.close(fd)
+        if tmp_path is not None:
+            os.unlink(tmp_path)
 
 if __name__ == "__main__":
     import uvicorn